@@ -1,7 +1,456 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+
 import requests
-import xmltodict
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Shared session so keep-alive reuses the same connection across consecutive API calls. The pool blocks
+# once all of its connections are busy, so parallel callers queue for a kept-alive connection instead of
+# opening extra sockets that are thrown away after a single request
+_SESSION = requests.Session()
+_SESSION.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip, deflate", "Accept": "application/xml",
+                         "User-Agent": "docsvault-client/1.0"})
+# Transient gateway errors are retried, and once the retries run out the last response is handed back so
+# raise_for_status() reports it as an HTTPError
+_ADAPTER = HTTPAdapter(pool_connections=16, pool_maxsize=32, pool_block=True,
+                       max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504),
+                                         allowed_methods=("GET", "POST"), raise_on_status=False))
+_SESSION.mount("http://", _ADAPTER)
+_SESSION.mount("https://", _ADAPTER)
+
+# (connect, read) timeouts in seconds, so a hung server cannot block the calling thread forever
+_TIMEOUT = (3.05, 27)
+
+# libxml2 parser settings shared by all response parsing: the responses are plain data, so skip entity
+# expansion, network access and xml:id bookkeeping, and drop the indentation whitespace between elements
+_PARSER_OPTIONS = {"resolve_entities": False, "no_network": True, "collect_ids": False, "remove_blank_text": True}
+_PARSER = etree.XMLParser(**_PARSER_OPTIONS)
+
+# XPath expressions used on every response, compiled once, relative to the root <Docsvault> element
+_XP_STATUS = etree.XPath("Response/StatusCode/text()", smart_strings=False)
+_XP_MSG = etree.XPath("Response/Message/text()", smart_strings=False)
+_XP_RESULT = etree.XPath("Result/text()", smart_strings=False)
+_XP_TOKEN_ID = etree.XPath("Result/TokenID/text()", smart_strings=False)
+_XP_USER_ID = etree.XPath("Result/UserID/text()", smart_strings=False)
+_XP_USER = etree.XPath("Result/UserDetail")
+_XP_FILE = etree.XPath("Result/FileDetail")
+_XP_INDEXES = etree.XPath("Result/FileDetail/ListOfIndexes/Indexes")
+_XP_FOLDER = etree.XPath("Result/FolderDetail")
+_XP_FOLDER_INDEXES = etree.XPath("Result/FolderDetail/ListOfIndexes/Indexes")
+
+# Token IDs are valid for the 20 minute default session timeout, cache them with a safety margin below that.
+# Lower this if the 'APISessionTimeout' of the server was shortened, or set it to 0 to disable the token cache
+TOKEN_TTL = 18 * 60
+_TOKEN_CACHE: dict[tuple[str, str, str], tuple[str, float]] = {}
+_USERID_CACHE: dict[str, str] = {}
+
+# Read-only lookups are cached per Token ID for a few minutes, bounded to the most recently stored entries
+_LOOKUP_TTL = 5 * 60
+# File and folder metadata changes more often (e.g. on check out), so it is only cached for a minute
+_DOCUMENT_TTL = 60
+_LOOKUP_MAXSIZE = 1024
+_LOOKUP_CACHE: dict[tuple, tuple[object, float]] = {}
+_LOOKUP_LOCK = threading.Lock()
+
+# (dictionary key, XML tag) pairs of the user details returned by the user functions
+_USER_FIELDS = (
+    ("user_id", "UserID"),
+    ("user_name", "UserName"),
+    ("full_name", "UserFullName"),
+    ("description", "UserDescription"),
+    ("email", "UserEmail"),
+    ("dv_authentication", "DVAuthentication"),
+    ("web_access", "WebAccess"),
+    ("license_type", "LicenseType")
+)
+_CONNECTED_USER_FIELDS = _USER_FIELDS[:-1] + (("login_from", "LoginFrom"),) + _USER_FIELDS[-1:]
+_GROUP_FIELDS = (("group_name", "GroupName"), ("group_id", "GroupID"), ("description", "Description"))
+
+# (dictionary key, XML tag) pairs of the file details returned by the file detail functions
+_FILE_FIELDS = (
+    ("file_id", "FileID"),
+    ("parent_id", "ParentID"),
+    ("file_name", "FileName"),
+    ("description", "Description"),
+    ("flag_name", "FlagName"),
+    ("file_size", "FileSize"),
+    ("doc_type", "DocType"),
+    ("pages", "Pages"),
+    ("version", "Version"),
+    ("version_note", "VersionNote"),
+    ("version_owner", "VersionOwner"),
+    ("version_owner_name", "VersionOwnerName"),
+    ("modified_date", "ModifiedDate"),
+    ("created_date", "CreatedDate"),
+    ("accessed_date", "AccessedDate"),
+    ("checked_out", "CheckedOut"),
+    ("checked_out_by", "CheckedOutBy"),
+    ("checked_out_by_name", "CheckedOutByName"),
+    ("owner_id", "OwnerID"),
+    ("owner_name", "OwnerName"),
+    ("location", "Location"),
+    ("doc_notes", "DocNotes"),
+    ("profile_id", "ProfileID"),
+    ("profile_name", "ProfileName")
+)
+# The checked out file records end at the location field
+_CHECKED_OUT_FIELDS = _FILE_FIELDS[:21]
+_INDEX_FIELDS = (("index", "Index"), ("index_value", "IndexValue"))
+
+# (dictionary key, XML tag) pairs of the folder details returned by the folder detail functions
+_FOLDER_FIELDS = (
+    ("folder_id", "FolderID"),
+    ("parent_id", "ParentID"),
+    ("folder_name", "FolderName"),
+    ("description", "Description"),
+    ("flag_name", "FlagName"),
+    ("has_child", "HasChild"),
+    ("modified_date", "ModifiedDate"),
+    ("created_date", "CreatedDate"),
+    ("accessed_date", "AccessedDate"),
+    ("checked_out", "CheckedOut"),
+    ("checked_out_by", "CheckedOutBy"),
+    ("checked_out_by_name", "CheckedOutByName"),
+    ("owner_id", "OwnerID"),
+    ("owner_name", "OwnerName"),
+    ("location", "Location"),
+    ("doc_notes", "DocNotes"),
+    ("profile_id", "ProfileID"),
+    ("profile_name", "ProfileName")
+)
+# The file and folder profile functions only return the profile fields of the record
+_PROFILE_FIELDS = (("flag_name", "FlagName"), ("doc_notes", "DocNotes"), ("profile_name", "ProfileName"))
+
+# (dictionary key, XML tag) pairs of the file version and related document records
+_VERSION_FIELDS = (
+    ("file_size", "FileSize"),
+    ("version", "Version"),
+    ("version_note", "VersionNote"),
+    ("version_owner", "VersionOwner"),
+    ("version_owner_name", "VersionOwnerName"),
+    ("created_date", "CreatedDate"),
+    ("version_notes", "VersionNotes")
+)
+_RELATION_FIELDS = (("file_id", "FileID"), ("description", "Description"), ("location", "Location"))
+_RELATED_DOC_FIELDS = (
+    ("doc_id", "DocID"),
+    ("doc_name", "DocName"),
+    ("doc_type", "DocType"),
+    ("version", "Version"),
+    ("folder_id", "FolderID"),
+    ("folder_name", "FolderName"),
+    ("location", "Location"),
+    ("modified_date", "ModifiedDate"),
+    ("created_date", "CreatedDate"),
+    ("accessed_date", "AccessedDate"),
+    ("size", "Size"),
+    ("extension", "Extension"),
+    ("checksum", "Checksum"),
+    ("pages", "Pages"),
+    ("author", "Author"),
+    ("title", "Title"),
+    ("subject", "Subject"),
+    ("keywords", "Keywords"),
+    ("category", "Category"),
+    ("status", "Status"),
+    ("comment", "Comment"),
+    ("owner_id", "OwnerID"),
+    ("owner_name", "OwnerName"),
+    ("file_path", "FilePath"),
+    ("doc_notes", "DocNotes"),
+    ("workflow_status", "WorkflowStatus"),
+    ("web_access", "WebAccess"),
+    ("task_id", "TaskID")
+)
+
+def docsvault_close() -> None:
+    """
+    Closes the shared HTTP session and releases its pooled connections.
+
+    Note:
+        Call this once you are done with the Docsvault API, e.g. on application shutdown. A later API call
+        will transparently open a new connection.
+
+    """
+    _SESSION.close()
+
+def docsvault_invalidate(token_id: str) -> None:
+    """
+    Drops everything cached for a Token ID, so the next login with the same credentials opens a new session.
+
+    Args:
+        token_id (str): The unique Token ID of the session to forget.
+
+    """
+    for key, (cached_token_id, _) in list(_TOKEN_CACHE.items()):
+        if cached_token_id == token_id:
+            _TOKEN_CACHE.pop(key, None)
+    _USERID_CACHE.pop(token_id, None)
+    with _LOOKUP_LOCK:
+        for key in [key for key in _LOOKUP_CACHE if key[1] == token_id]:
+            del _LOOKUP_CACHE[key]
+
+def docsvault_invalidate_lookup(token_id: str, key: str) -> None:
+    """
+    Drops the cached lookups made with a Token ID for a key, e.g. after the file or folder it names was changed.
+
+    Args:
+        token_id (str): The unique Token ID of the session the lookups were made with.
+        key (str): The ID, location, name or email address that was looked up.
+
+    """
+    with _LOOKUP_LOCK:
+        for cache_key in list(_LOOKUP_CACHE):
+            # Keyword arguments are stored as (name, value) pairs
+            values = [value[1] if isinstance(value, tuple) else value for value in cache_key[2:]]
+            if cache_key[1] == token_id and key in values:
+                del _LOOKUP_CACHE[cache_key]
+
+def docsvault_batch(func: Callable, args_list: Iterable[tuple], max_workers: int = 16) -> list:
+    """
+    Calls a docsvault_* function once per argument tuple, running the calls in parallel on a thread pool.
+
+    Args:
+        func (Callable): The Docsvault API function to call, e.g. docsvault_get_user_details_by_id.
+        args_list (Iterable[tuple]): The positional arguments of each call.
+        max_workers (int, optional): The maximum number of concurrent calls. Defaults to 16.
+
+    Returns:
+        list: The results of the calls, in the order of args_list.
+
+    Raises:
+        requests.exceptions.RequestException: If there was an error making one of the API requests.
+        ValueError: If one of the API responses indicates an error.
+
+    Note:
+        The threads share the pooled session, which opens at most 32 connections per host. With more workers
+        than that, the extra calls wait for a free connection.
+
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda args: func(*args), args_list))
+
+def _fan_out(func: Callable, token_id: str, api_url: str, ids: Iterable[str], max_workers: int,
+             session: requests.Session | None) -> list:
+    """
+    Calls func(token_id, api_url, id, session=session) once per ID with docsvault_batch() and returns the results.
+    """
+    return docsvault_batch(functools.partial(func, session=session), [(token_id, api_url, item_id) for item_id in ids],
+                           max_workers)
+
+def _token_cache_key(username: str, password: str, api_url: str) -> tuple[str, str, str]:
+    """
+    Builds the login cache key, keeping only a digest of the password in memory.
+    """
+    return username, hashlib.sha256(password.encode()).hexdigest(), api_url
+
+def _get_cached_token(cache_key: tuple[str, str, str]) -> str | None:
+    """
+    Returns the cached Token ID for cache_key if it has not expired yet.
+    """
+    cached = _TOKEN_CACHE.get(cache_key)
+    if cached is not None and time.monotonic() < cached[1]:
+        return cached[0]
+    return None
+
+def _copy_result(result):
+    """
+    Copies the dictionaries and lists of a cached result, the strings and other values inside are shared.
+    """
+    if isinstance(result, dict):
+        return {key: _copy_result(value) for key, value in result.items()}
+    if isinstance(result, list):
+        return [_copy_result(value) for value in result]
+    return result
+
+def _cached(ttl: float):
+    """
+    Memoizes a read-only lookup for ttl seconds, keyed by the function and its arguments.
+
+    The first argument of the function must be the Token ID, so docsvault_invalidate() can drop the entries of
+    a session. Passing cache=False skips the cached result and stores the fresh one. Every caller gets its own
+    copy of the result, so modifying it does not change what later calls return.
+
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(token_id, *args, cache=True, **kwargs):
+            # The session only decides how the request is sent, not what it returns
+            key = (func.__name__, token_id) + args
+            key += tuple(sorted(item for item in kwargs.items() if item[0] != "session"))
+            if cache:
+                cached = _LOOKUP_CACHE.get(key)
+                if cached is not None and time.monotonic() < cached[1]:
+                    return _copy_result(cached[0])
+
+            result = func(token_id, *args, **kwargs)
+            with _LOOKUP_LOCK:
+                # Evict the oldest entry once the cache is full, dicts keep insertion order
+                _LOOKUP_CACHE.pop(key, None)
+                if len(_LOOKUP_CACHE) >= _LOOKUP_MAXSIZE:
+                    del _LOOKUP_CACHE[next(iter(_LOOKUP_CACHE))]
+                _LOOKUP_CACHE[key] = (result, time.monotonic() + ttl)
+            return _copy_result(result)
+
+        return wrapper
+
+    return decorator
+
+def _to_async(func):
+    """
+    Wraps a blocking docsvault_* function into a coroutine function that runs it on a worker thread.
+
+    The worker threads share the pooled session, so many calls awaited together with asyncio.gather() are
+    overlapped over a small set of kept-alive connections.
+
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    wrapper.__name__ = wrapper.__qualname__ = func.__name__ + "_async"
+    return wrapper
+
+@functools.lru_cache(maxsize=64)
+def _endpoint(api_url: str, action: str) -> str:
+    """
+    Builds the full URL of a Docsvault API action, e.g. "UserDetails/GetUserDetailsByID".
+
+    The URL is computed once per (API endpoint URL, action) pair.
 
-def docsvault_login(username: str, password: str, api_url: str) -> str:
+    """
+    return api_url.rstrip("/") + "/DocsvaultAPI/" + action
+
+def _parse(response: requests.Response) -> etree._Element:
+    """
+    Parses the streamed XML body of a Docsvault API response and returns its root <Docsvault> element.
+
+    The body is fed from the socket straight into the parser, without buffering it as bytes first. The parser
+    reads the encoding from the XML declaration, so responses must always be parsed as bytes: response.text
+    would run the charset detection of requests over the whole body and lxml refuses str input that carries an
+    encoding declaration.
+
+    """
+    response.raw.decode_content = True
+    return etree.parse(response.raw, _PARSER).getroot()
+
+def _check_status(root: etree._Element, error_prefix: str) -> None:
+    """
+    Raises a ValueError prefixed with error_prefix if the parsed API response reports an error.
+    """
+    # Compare and report the stripped texts, like xmltodict returned them
+    if "".join(_XP_STATUS(root)).strip() != "0":
+        raise ValueError(error_prefix + " " + "".join(_XP_MSG(root)).strip())
+
+def _call(api_url: str, action: str, params: dict, error_prefix: str, method: str = "GET",
+          session: requests.Session | None = None) -> etree._Element:
+    """
+    Sends a request for a Docsvault API action and returns the root element of the parsed response.
+
+    The request is sent with session if given, otherwise with the shared session.
+
+    Raises a requests.exceptions.HTTPError if the server answered with an error status code, any other
+    requests.exceptions.RequestException if the request failed, and a ValueError prefixed with error_prefix
+    if the API response reports an error.
+
+    """
+    # POST requests send the parameters form-encoded in the body, keeping e.g. credentials out of the URL
+    if method == "POST":
+        request_args = {"data": params}
+    else:
+        request_args = {"params": params}
+
+    with (session or _SESSION).request(method, _endpoint(api_url, action), stream=True, timeout=_TIMEOUT,
+                                       **request_args) as response:
+        response.raise_for_status()
+        root = _parse(response)
+
+    _check_status(root, error_prefix)
+    return root
+
+def _iter_call(api_url: str, action: str, params: dict, tag: str, error_prefix: str,
+               session: requests.Session | None = None):
+    """
+    Sends a GET request for a Docsvault API action and streams the <tag> record elements of the response.
+
+    See _call() for the session and _call() and _iterparse() for the raised errors.
+
+    """
+    with (session or _SESSION).get(_endpoint(api_url, action), params=params, stream=True,
+                                   timeout=_TIMEOUT) as response:
+        response.raise_for_status()
+        yield from _iterparse(response, tag, error_prefix)
+
+def _strip(text: str | None) -> str | None:
+    """
+    Strips the surrounding whitespace off an element text like xmltodict did, mapping blank text to None.
+    """
+    return (text.strip() or None) if text else None
+
+def _project(element: etree._Element, fields: tuple[tuple[str, str], ...]) -> dict:
+    """
+    Converts a record element into a dictionary, using the text of the child tag of each (key, tag) pair in fields.
+
+    The children are read in a single pass. Their text is stripped, tags missing from the record as well as
+    empty and whitespace-only elements map to None.
+
+    """
+    texts = {child.tag: child.text for child in element}
+    return {key: _strip(texts.get(tag)) for key, tag in fields}
+
+def _folder_detail(api_url: str, action: str, params: dict, fields: tuple[tuple[str, str], ...], error_prefix: str,
+                   session: requests.Session | None) -> dict:
+    """
+    Sends a request for a folder detail action and projects its <FolderDetail> record through fields.
+
+    The index values of the folder are added as list_of_indexes. See _call() for the raised errors.
+
+    """
+    root = _call(api_url, action, params, error_prefix, session=session)
+    folder_details = _XP_FOLDER(root) or [etree.Element("FolderDetail")]
+    folder_detail = _project(folder_details[0], fields)
+    folder_detail["list_of_indexes"] = [_project(index, _INDEX_FIELDS) for index in _XP_FOLDER_INDEXES(root)]
+    return folder_detail
+
+def _iterparse(response: requests.Response, tag: str, error_prefix: str):
+    """
+    Incrementally parses a streamed API response and yields each <tag> record element as soon as it is complete.
+
+    Records are cleared once the caller has consumed them, so memory stays bounded by a single record instead
+    of the whole document. Raises a ValueError prefixed with error_prefix if the API response reports an error
+    or has no <Response> status at all, e.g. a login page served by a proxy.
+
+    """
+    response.raw.decode_content = True
+    status_checked = False
+    for _, elem in etree.iterparse(response.raw, events=("end",), tag=(tag, "Response"), **_PARSER_OPTIONS):
+        if elem.tag == "Response":
+            _check_status(elem.getparent(), error_prefix)
+            status_checked = True
+            continue
+
+        yield elem
+
+        # Free the processed record and any already processed siblings
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    # Without a status the body is not a Docsvault API response, so its lack of records means nothing
+    if not status_checked:
+        raise ValueError(error_prefix + " Response status not found in API response.")
+
+def docsvault_login(username: str, password: str, api_url: str, *, session: requests.Session | None = None,
+                    cache: bool = True) -> str:
     """
     Logs into the Docsvault API and returns the Token ID for a unique session.
 
@@ -9,6 +458,8 @@ def docsvault_login(username: str, password: str, api_url: str) -> str:
         username (str): The Docsvault user name or Windows username with AD authentication used in Docsvault.
         password (str): The user's password in Docsvault or AD depending on the authentication type.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether the cached Token ID of an earlier login may be returned. Defaults to True.
 
     Returns:
         str: The Token ID valid for a unique session.
@@ -20,12 +471,20 @@ def docsvault_login(username: str, password: str, api_url: str) -> str:
         The unique Token ID returned by this function is only valid for the current session. Once the session has
         expired, you will need to get a new Token ID before making further calls. The session timeout is set to
         20 minutes by default. You can change this by changing the value for the 'APISessionTimeout' tag in the
-        web.config file located in the 'Docsvault Web' program folder.
+        web.config file located in the 'Docsvault Web' program folder. Logging in again with the same credentials
+        within TOKEN_TTL seconds returns the cached Token ID instead of opening a new session, pass cache=False to
+        always open a new one.
 
     Raises:
         ValueError: If the API response did not contain a valid Token ID.
 
     """
+    # Reuse the Token ID of a previous login with the same credentials while it is still valid
+    cache_key = _token_cache_key(username, password, api_url)
+    token_id = _get_cached_token(cache_key) if cache else None
+    if token_id is not None:
+        return token_id
+
     # Set the API action and parameters
     action = "Login"
     params = {
@@ -33,33 +492,19 @@ def docsvault_login(username: str, password: str, api_url: str) -> str:
         "Password": password
     }
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url + action, params=params)
+    # Send the API request and check the response for any errors
+    root = _call(api_url, action, params, "Login failed.", session=session)
 
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
+    # Extract the Token ID from the API response
+    token_id = "".join(_XP_TOKEN_ID(root)).strip()
+    if not token_id:
+        raise ValueError("Login failed. Token ID not found in API response.")
 
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "1":
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Login failed. " + error_message)
+    _TOKEN_CACHE[cache_key] = (token_id, time.monotonic() + TOKEN_TTL)
+    return token_id
 
-        # Extract the Token ID from the API response
-        token_id = response_dict["Docsvault"]["Result"]["TokenID"]
-        if token_id is None or token_id == "":
-            raise ValueError("Login failed. Token ID not found in API response.")
-
-        return token_id
-    else:
-        raise requests.exceptions.RequestException("Login request failed with status code: " + str(response.status_code))
-
-def docsvault_login_post(username: str, password: str, api_url: str) -> str:
+def docsvault_login_post(username: str, password: str, api_url: str, *, session: requests.Session | None = None,
+                         cache: bool = True) -> str:
     """
     Logs into the Docsvault API using the POST method and returns the Token ID for a unique session.
 
@@ -67,6 +512,8 @@ def docsvault_login_post(username: str, password: str, api_url: str) -> str:
         username (str): The Docsvault user name or Windows username with AD authentication used in Docsvault.
         password (str): The user's password in Docsvault or AD depending on the authentication type.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether the cached Token ID of an earlier login may be returned. Defaults to True.
 
     Returns:
         str: The Token ID valid for a unique session.
@@ -79,12 +526,20 @@ def docsvault_login_post(username: str, password: str, api_url: str) -> str:
         The unique Token ID returned by this function is only valid for the current session. Once the session has
         expired, you will need to get a new Token ID before making further calls. The session timeout is set to
         20 minutes by default. You can change this by changing the value for the 'APISessionTimeout' tag in the
-        web.config file located in the 'Docsvault Web' program folder.
+        web.config file located in the 'Docsvault Web' program folder. Logging in again with the same credentials
+        within TOKEN_TTL seconds returns the cached Token ID instead of opening a new session, pass cache=False to
+        always open a new one.
 
     Raises:
         ValueError: If the API response did not contain a valid Token ID.
 
     """
+    # Reuse the Token ID of a previous login with the same credentials while it is still valid
+    cache_key = _token_cache_key(username, password, api_url)
+    token_id = _get_cached_token(cache_key) if cache else None
+    if token_id is not None:
+        return token_id
+
     # Set the API action and parameters
     action = "LoginPost"
     params = {
@@ -92,33 +547,18 @@ def docsvault_login_post(username: str, password: str, api_url: str) -> str:
         "Password": password
     }
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
+    # Send the API request and check the response for any errors
+    root = _call(api_url, action, params, "Login failed.", method="POST", session=session)
 
-    # Send the API request
-    response = requests.post(full_api_url, params=params)
+    # Extract the Token ID from the API response
+    token_id = "".join(_XP_RESULT(root)).strip()
+    if not token_id:
+        raise ValueError("Login failed. Token ID not found in API response.")
 
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
+    _TOKEN_CACHE[cache_key] = (token_id, time.monotonic() + TOKEN_TTL)
+    return token_id
 
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "1":
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Login failed. " + error_message)
-
-        # Extract the Token ID from the API response
-        token_id = response_dict["Docsvault"]["Result"]
-        if token_id is None or token_id == "":
-            raise ValueError("Login failed. Token ID not found in API response.")
-
-        return token_id
-    else:
-        raise requests.exceptions.RequestException("Login request failed with status code: " + str(response.status_code))
-
-def docsvault_logout(token_id: str, username: str, api_url: str) -> None:
+def docsvault_logout(token_id: str, username: str, api_url: str, *, session: requests.Session | None = None) -> None:
     """
     Logs out of the Docsvault API and closes the unique session.
 
@@ -126,18 +566,22 @@ def docsvault_logout(token_id: str, username: str, api_url: str) -> None:
         token_id (str): The unique Token ID for the current session.
         username (str): The Docsvault user name or Active Directory name used in Docsvault.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
 
     Raises:
         requests.exceptions.RequestException: If there was an error making the API request.
 
     Note:
         Once you have finished making API calls with the current session, you should call this function to log out
-        of the API and close the session.
+        of the API and close the session. The cached Token ID and User ID of the session are dropped as well.
 
     Raises:
         ValueError: If the API response indicates an error.
 
     """
+    # Forget the cached session state, the Token ID must not be reused after logging out
+    docsvault_invalidate(token_id)
+
     # Set the API action and parameters
     action = "Logout"
     params = {
@@ -145,32 +589,17 @@ def docsvault_logout(token_id: str, username: str, api_url: str) -> None:
         "UserName": username
     }
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "1":
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Logout failed. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Logout request failed with status code: " + str(response.status_code))
+    # Send the API request and check the response for any errors
+    _call(api_url, action, params, "Logout failed.", session=session)
 
-def docsvault_get_login_user_id(token_id: str, api_url: str) -> str:
+def docsvault_get_login_user_id(token_id: str, api_url: str, *, session: requests.Session | None = None) -> str:
     """
     Gets the user ID of the user logged in Docsvault API based on Token ID.
 
     Args:
         token_id (str): The Token ID for a unique session.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
 
     Returns:
         str: The User ID of the logged-in user.
@@ -180,39 +609,31 @@ def docsvault_get_login_user_id(token_id: str, api_url: str) -> str:
         ValueError: If the API response did not contain a valid User ID.
 
     """
+    # The logged-in user of a session never changes, so answer repeated lookups from the cache
+    user_id = _USERID_CACHE.get(token_id)
+    if user_id is not None:
+        return user_id
+
     # Set the API action and parameters
     action = "GetLoginUserID"
     params = {
         "TokenID": token_id,
     }
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
+    # Send the API request and check the response for any errors
+    root = _call(api_url, action, params, "GetLoginUserID failed.", session=session)
 
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "1":
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("GetLoginUserID failed. " + error_message)
+    # Extract the User ID from the API response
+    user_id = "".join(_XP_USER_ID(root)).strip()
+    if not user_id:
+        raise ValueError("GetLoginUserID failed. User ID not found in API response.")
 
-        # Extract the User ID from the API response
-        user_id = response_dict["Docsvault"]["Result"]["UserID"]
-        if user_id is None or user_id == "":
-            raise ValueError("GetLoginUserID failed. User ID not found in API response.")
-
-        return user_id
-    else:
-        raise requests.exceptions.RequestException("GetLoginUserID request failed with status code: " + str(response.status_code))
+    _USERID_CACHE[token_id] = user_id
+    return user_id
 
-def docsvault_get_user_details_by_name(token_id: str, user_name: str, api_url: str) -> dict:
+@_cached(_LOOKUP_TTL)
+def docsvault_get_user_details_by_name(token_id: str, user_name: str, api_url: str,
+                                       *, session: requests.Session | None = None, cache: bool = True) -> dict:
     """
     Gets the details of a user by their username in Docsvault.
 
@@ -220,6 +641,8 @@ def docsvault_get_user_details_by_name(token_id: str, user_name: str, api_url: s
         token_id (str): The unique session ID.
         user_name (str): The Docsvault user name or Windows username with AD authentication used in Docsvault.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last 5 minutes may be returned. Defaults to True.
 
     Returns:
         dict: A dictionary containing the user details.
@@ -236,41 +659,20 @@ def docsvault_get_user_details_by_name(token_id: str, user_name: str, api_url: s
         "UserName": user_name
     }
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the user details from the API response
-            user_detail = response_dict["Docsvault"]["Result"]["UserDetail"]
-
-            # Return the user details as a dictionary
-            return {
-                "user_id": user_detail["UserID"],
-                "user_name": user_detail["UserName"],
-                "full_name": user_detail["UserFullName"],
-                "description": user_detail["UserDescription"],
-                "email": user_detail["UserEmail"],
-                "dv_authentication": user_detail["DVAuthentication"],
-                "web_access": user_detail["WebAccess"],
-                "license_type": user_detail["LicenseType"]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get user details. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get user details. Status code: " + str(response.status_code))
+    # Send the API request and check the response for any errors
+    root = _call(api_url, action, params, "Could not get user details.", session=session)
+
+    # Extract the user details from the API response
+    user_details = _XP_USER(root)
+    if not user_details:
+        raise ValueError("Could not get user details. User details not found in API response.")
 
-def docsvault_get_user_details_by_id(token_id: str, user_id: str, api_url: str) -> dict:
+    # Return the user details as a dictionary
+    return _project(user_details[0], _USER_FIELDS)
+
+@_cached(_LOOKUP_TTL)
+def docsvault_get_user_details_by_id(token_id: str, user_id: str, api_url: str,
+                                     *, session: requests.Session | None = None, cache: bool = True) -> dict:
     """
     Gets the details of a user by their user ID in Docsvault.
 
@@ -278,6 +680,8 @@ def docsvault_get_user_details_by_id(token_id: str, user_id: str, api_url: str)
         token_id (str): The unique session ID.
         user_id (str): The unique user ID in Docsvault.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last 5 minutes may be returned. Defaults to True.
 
     Returns:
         dict: A dictionary containing the user details.
@@ -294,41 +698,20 @@ def docsvault_get_user_details_by_id(token_id: str, user_id: str, api_url: str)
         "UserID": user_id
     }
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the user details from the API response
-            user_detail = response_dict["Docsvault"]["Result"]["UserDetail"]
-
-            # Return the user details as a dictionary
-            return {
-                "user_id": user_detail["UserID"],
-                "user_name": user_detail["UserName"],
-                "full_name": user_detail["UserFullName"],
-                "description": user_detail["UserDescription"],
-                "email": user_detail["UserEmail"],
-                "dv_authentication": user_detail["DVAuthentication"],
-                "web_access": user_detail["WebAccess"],
-                "license_type": user_detail["LicenseType"]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get user details. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get user details. Status code: " + str(response.status_code))
+    # Send the API request and check the response for any errors
+    root = _call(api_url, action, params, "Could not get user details.", session=session)
 
-def docsvault_get_user_details_by_email(token_id: str, email: str, api_url: str) -> dict:
+    # Extract the user details from the API response
+    user_details = _XP_USER(root)
+    if not user_details:
+        raise ValueError("Could not get user details. User details not found in API response.")
+
+    # Return the user details as a dictionary
+    return _project(user_details[0], _USER_FIELDS)
+
+@_cached(_LOOKUP_TTL)
+def docsvault_get_user_details_by_email(token_id: str, email: str, api_url: str,
+                                        *, session: requests.Session | None = None, cache: bool = True) -> dict:
     """
     Gets the details of a user by their email address in Docsvault.
 
@@ -336,6 +719,8 @@ def docsvault_get_user_details_by_email(token_id: str, email: str, api_url: str)
         token_id (str): The unique session ID.
         email (str): The email address of the Docsvault user.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last 5 minutes may be returned. Defaults to True.
 
     Returns:
         dict: A dictionary containing the user details.
@@ -352,47 +737,25 @@ def docsvault_get_user_details_by_email(token_id: str, email: str, api_url: str)
         "EmailID": email
     }
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the user details from the API response
-            user_detail = response_dict["Docsvault"]["Result"]["UserDetail"]
-
-            # Return the user details as a dictionary
-            return {
-                "user_id": user_detail["UserID"],
-                "user_name": user_detail["UserName"],
-                "full_name": user_detail["UserFullName"],
-                "description": user_detail["UserDescription"],
-                "email": user_detail["UserEmail"],
-                "dv_authentication": user_detail["DVAuthentication"],
-                "web_access": user_detail["WebAccess"],
-                "license_type": user_detail["LicenseType"]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get user details. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get user details. Status code: " + str(response.status_code))
+    # Send the API request and check the response for any errors
+    root = _call(api_url, action, params, "Could not get user details.", session=session)
 
-def docsvault_get_readonly_users(token_id: str, api_url: str) -> list:
+    # Extract the user details from the API response
+    user_details = _XP_USER(root)
+    if not user_details:
+        raise ValueError("Could not get user details. User details not found in API response.")
+
+    # Return the user details as a dictionary
+    return _project(user_details[0], _USER_FIELDS)
+
+def docsvault_get_readonly_users(token_id: str, api_url: str, *, session: requests.Session | None = None) -> list:
     """
     Gets a list of all users with Read Only rights in Docsvault.
 
     Args:
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
 
     Returns:
         list: A list of dictionaries containing the user details.
@@ -406,51 +769,20 @@ def docsvault_get_readonly_users(token_id: str, api_url: str) -> list:
     action = "UserDetails/GetReadonlyUsers"
     params = {"TokenID": token_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the user details from the API response
-            user_details = response_dict["Docsvault"]["Result"]["UserDetail"]
-
-            # If there is only one user, wrap it in a list to maintain consistency
-            if isinstance(user_details, dict):
-                user_details = [user_details]
-
-            # Return the user details as a list of dictionaries
-            return [{
-                "user_id": user_detail["UserID"],
-                "user_name": user_detail["UserName"],
-                "full_name": user_detail["UserFullName"],
-                "description": user_detail["UserDescription"],
-                "email": user_detail["UserEmail"],
-                "dv_authentication": user_detail["DVAuthentication"],
-                "web_access": user_detail["WebAccess"],
-                "license_type": user_detail["LicenseType"]
-            } for user_detail in user_details]
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get readonly users. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get readonly users. Status code: " + str(response.status_code))
+    # Send the API request and parse the records as they arrive
+    user_details = _iter_call(api_url, action, params, "UserDetail", "Could not get readonly users.", session=session)
 
-def docsvault_get_webaccess_users(token_id: str, api_url: str) -> list:
+    # Return the user details as a list of dictionaries
+    return [_project(user_detail, _USER_FIELDS) for user_detail in user_details]
+
+def docsvault_get_webaccess_users(token_id: str, api_url: str, *, session: requests.Session | None = None) -> list:
     """
     Gets a list of all users with Web Access rights in Docsvault.
 
     Args:
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
 
     Returns:
         list: A list of dictionaries containing the user details.
@@ -463,45 +795,15 @@ def docsvault_get_webaccess_users(token_id: str, api_url: str) -> list:
     action = "UserDetails/GetWebAccessUsers"
     params = {"TokenID": token_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the user details from the API response
-            user_details = response_dict["Docsvault"]["Result"]["UserDetail"]
-
-            # If there is only one user, wrap it in a list to maintain consistency
-            if isinstance(user_details, dict):
-                user_details = [user_details]
-
-            # Return the user details as a list of dictionaries
-            return [{
-                "user_id": user_detail["UserID"],
-                "user_name": user_detail["UserName"],
-                "full_name": user_detail["UserFullName"],
-                "description": user_detail["UserDescription"],
-                "email": user_detail["UserEmail"],
-                "dv_authentication": user_detail["DVAuthentication"],
-                "web_access": user_detail["WebAccess"],
-                "license_type": user_detail["LicenseType"]
-            } for user_detail in user_details]
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get Web Access users. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get Web Access users. Status code: " + str(response.status_code))
+    # Send the API request and parse the records as they arrive
+    user_details = _iter_call(api_url, action, params, "UserDetail", "Could not get Web Access users.", session=session)
+
+    # Return the user details as a list of dictionaries
+    return [_project(user_detail, _USER_FIELDS) for user_detail in user_details]
 
-def docsvault_get_user_groups(token_id: str, user_id: str, api_url: str) -> list:
+@_cached(_LOOKUP_TTL)
+def docsvault_get_user_groups(token_id: str, user_id: str, api_url: str,
+                              *, session: requests.Session | None = None, cache: bool = True) -> list:
     """
     Gets the groups of a user by passing his/her User ID.
 
@@ -509,6 +811,8 @@ def docsvault_get_user_groups(token_id: str, user_id: str, api_url: str) -> list
         token_id (str): The unique session ID.
         user_id (str): The unique user ID.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last 5 minutes may be returned. Defaults to True.
 
     Returns:
         list: A list of dictionaries containing the group details.
@@ -522,46 +826,20 @@ def docsvault_get_user_groups(token_id: str, user_id: str, api_url: str) -> list
     action = "UserDetails/GetUserGroup"
     params = {"TokenID": token_id, "UserID": user_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the group details from the API response
-            group_details = response_dict["Docsvault"]["Result"]["Group"]
-
-            # If there is only one group, wrap it in a list to maintain consistency
-            if isinstance(group_details, dict):
-                group_details = [group_details]
-
-            # Return the group details as a list of dictionaries
-            return [{
-                "group_name": group_detail["GroupName"],
-                "group_id": group_detail["GroupID"],
-                "description": group_detail["Description"]
-            } for group_detail in group_details]
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get user groups. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get user groups. Status code: " + str(response.status_code))
+    # Send the API request and parse the records as they arrive
+    group_details = _iter_call(api_url, action, params, "Group", "Could not get user groups.", session=session)
+
+    # Return the group details as a list of dictionaries
+    return [_project(group_detail, _GROUP_FIELDS) for group_detail in group_details]
 
-def docsvault_get_connected_users(token_id: str, api_url: str) -> list:
+def docsvault_get_connected_users(token_id: str, api_url: str, *, session: requests.Session | None = None) -> list:
     """
     Gets a list of all currently connected users in Docsvault.
 
     Args:
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
 
     Returns:
         list: A list of dictionaries containing the connected user details.
@@ -575,100 +853,15 @@ def docsvault_get_connected_users(token_id: str, api_url: str) -> list:
     action = "UserDetails/GetConnectedUsers"
     params = {"TokenID": token_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the user details from the API response
-            user_details = response_dict["Docsvault"]["Result"]["UserDetail"]
-
-            # If there is only one user, wrap it in a list to maintain consistency
-            if isinstance(user_details, dict):
-                user_details = [user_details]
-
-            # Return the user details as a list of dictionaries
-            return [{
-                "user_id": user_detail["UserID"],
-                "user_name": user_detail["UserName"],
-                "full_name": user_detail["UserFullName"],
-                "description": user_detail["UserDescription"],
-                "email": user_detail["UserEmail"],
-                "dv_authentication": user_detail["DVAuthentication"],
-                "web_access": user_detail["WebAccess"],
-                "login_from": user_detail["LoginFrom"],
-                "license_type": user_detail["LicenseType"]
-            } for user_detail in user_details]
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get connected users. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get connected users. Status code: " + str(response.status_code))
-
-def docsvault_get_user_groups(token_id: str, api_url: str, user_id: str) -> list:
-    """
-    Gets the groups that a user belongs to in Docsvault.
-
-    Args:
-        token_id (str): The unique session ID.
-        api_url (str): The Docsvault API endpoint URL.
-        user_id (str): The unique user ID.
-
-    Returns:
-        list: A list of dictionaries containing the user's group details.
-
-    Raises:
-        requests.exceptions.RequestException: If there was an error making the API request.
-        ValueError: If the API response did not contain any data or if the response status code was not 200.
-    """
+    # Send the API request and parse the records as they arrive
+    user_details = _iter_call(api_url, action, params, "UserDetail", "Could not get connected users.", session=session)
 
-    # Set the API action and parameters
-    action = "UserDetails/GetUserGroup"
-    params = {"TokenID": token_id, "UserID": user_id}
+    # Return the user details as a list of dictionaries
+    return [_project(user_detail, _CONNECTED_USER_FIELDS) for user_detail in user_details]
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the group details from the API response
-            group_details = response_dict["Docsvault"]["Result"]["Group"]
-
-            # If there is only one group, wrap it in a list to maintain consistency
-            if isinstance(group_details, dict):
-                group_details = [group_details]
-
-            # Return the group details as a list of dictionaries
-            return [{
-                "group_name": group_detail["GroupName"],
-                "group_id": group_detail["GroupID"],
-                "description": group_detail["Description"]
-            } for group_detail in group_details]
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get user groups. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get user groups. Status code: " + str(response.status_code))
-
-def docsvault_get_file_details(token_id: str, api_url: str, file_id: str) -> dict:
+@_cached(_DOCUMENT_TTL)
+def docsvault_get_file_details(token_id: str, api_url: str, file_id: str,
+                               *, session: requests.Session | None = None, cache: bool = True) -> dict:
     """
     Gets the details of a file in Docsvault.
 
@@ -676,6 +869,8 @@ def docsvault_get_file_details(token_id: str, api_url: str, file_id: str) -> dic
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         file_id (str): The unique file ID.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last minute may be returned. Defaults to True.
 
     Returns:
         dict: A dictionary containing the file details.
@@ -689,61 +884,23 @@ def docsvault_get_file_details(token_id: str, api_url: str, file_id: str) -> dic
     action = "FileDetails/GetFileDetailsByID"
     params = {"TokenID": token_id, "FileID": file_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the file details from the API response
-            file_details = response_dict["Docsvault"]["Result"]["FileDetail"]
-
-            # Return the file details as a dictionary
-            return {
-                "file_id": file_details["FileID"],
-                "parent_id": file_details["ParentID"],
-                "file_name": file_details["FileName"],
-                "description": file_details["Description"],
-                "flag_name": file_details["FlagName"],
-                "file_size": file_details["FileSize"],
-                "doc_type": file_details["DocType"],
-                "pages": file_details["Pages"],
-                "version": file_details["Version"],
-                "version_note": file_details["VersionNote"],
-                "version_owner": file_details["VersionOwner"],
-                "version_owner_name": file_details["VersionOwnerName"],
-                "modified_date": file_details["ModifiedDate"],
-                "created_date": file_details["CreatedDate"],
-                "accessed_date": file_details["AccessedDate"],
-                "checked_out": file_details.get("CheckedOut") == "true",
-                "checked_out_by": file_details.get("CheckedOutBy"),
-                "checked_out_by_name": file_details.get("CheckedOutByName"),
-                "owner_id": file_details["OwnerID"],
-                "owner_name": file_details["OwnerName"],
-                "location": file_details["Location"],
-                "doc_notes": file_details["DocNotes"],
-                "profile_id": file_details["ProfileID"],
-                "profile_name": file_details["ProfileName"],
-                "indexes": [
-                    {"index": index["Index"], "index_value": index["IndexValue"]}
-                    for index in file_details["ListOfIndexes"]["Indexes"]
-                ]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get file details. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get file details. Status code: " + str(response.status_code))
+    # Send the API request and check the response for any errors
+    root = _call(api_url, action, params, "Could not get file details.", session=session)
 
-def docsvault_get_file_details_by_location(token_id: str, api_url: str, location: str) -> dict:
+    # Extract the file details from the API response
+    records = _XP_FILE(root)
+    if not records:
+        raise ValueError("Could not get file details. File details not found in API response.")
+    file_details = _project(records[0], _FILE_FIELDS)
+    file_details["checked_out"] = file_details["checked_out"] == "true"
+    file_details["indexes"] = [_project(index, _INDEX_FIELDS) for index in _XP_INDEXES(root)]
+
+    # Return the file details as a dictionary
+    return file_details
+
+@_cached(_DOCUMENT_TTL)
+def docsvault_get_file_details_by_location(token_id: str, api_url: str, location: str,
+                                           *, session: requests.Session | None = None, cache: bool = True) -> dict:
     """
     Gets the file details by its name and location in Docsvault.
 
@@ -751,6 +908,8 @@ def docsvault_get_file_details_by_location(token_id: str, api_url: str, location
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         location (str): The full path with name of file starting from cabinet name.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last minute may be returned. Defaults to True.
 
     Returns:
         dict: A dictionary containing the file's details.
@@ -764,58 +923,22 @@ def docsvault_get_file_details_by_location(token_id: str, api_url: str, location
     action = "FileDetails/GetFileDetailsByLocation"
     params = {"TokenID": token_id, "Location": location}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the file details from the API response
-            file_detail = response_dict["Docsvault"]["Result"]["FileDetail"]
-
-            # Return the file details as a dictionary
-            return {
-                "file_id": file_detail["FileID"],
-                "parent_id": file_detail["ParentID"],
-                "file_name": file_detail["FileName"],
-                "description": file_detail["Description"],
-                "flag_name": file_detail["FlagName"],
-                "file_size": file_detail["FileSize"],
-                "doc_type": file_detail["DocType"],
-                "pages": file_detail["Pages"],
-                "version": file_detail["Version"],
-                "version_note": file_detail["VersionNote"],
-                "version_owner": file_detail["VersionOwner"],
-                "version_owner_name": file_detail["VersionOwnerName"],
-                "modified_date": file_detail["ModifiedDate"],
-                "created_date": file_detail["CreatedDate"],
-                "accessed_date": file_detail["AccessedDate"],
-                "checked_out": file_detail["CheckedOut"],
-                "checked_out_by": file_detail["CheckedOutBy"],
-                "checked_out_by_name": file_detail["CheckedOutByName"],
-                "owner_id": file_detail["OwnerID"],
-                "owner_name": file_detail["OwnerName"],
-                "location": file_detail["Location"],
-                "doc_notes": file_detail["DocNotes"],
-                "profile_id": file_detail["ProfileID"],
-                "profile_name": file_detail["ProfileName"],
-                "list_of_indexes": file_detail.get("ListOfIndexes", {}).get("Indexes", [])
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get file details. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get file details. Status code: " + str(response.status_code))
+    # Send the API request and check the response for any errors
+    root = _call(api_url, action, params, "Could not get file details.", session=session)
 
-def docsvault_get_file_profile(token_id: str, api_url: str, file_id: str) -> dict:
+    # Extract the file details from the API response
+    records = _XP_FILE(root)
+    if not records:
+        raise ValueError("Could not get file details. File details not found in API response.")
+    file_detail = _project(records[0], _FILE_FIELDS)
+    file_detail["list_of_indexes"] = [{child.tag: _strip(child.text) for child in index} for index in _XP_INDEXES(root)]
+
+    # Return the file details as a dictionary
+    return file_detail
+
+@_cached(_DOCUMENT_TTL)
+def docsvault_get_file_profile(token_id: str, api_url: str, file_id: str,
+                               *, session: requests.Session | None = None, cache: bool = True) -> dict:
     """
     Gets the profile and index values of a file by its File ID.
 
@@ -823,6 +946,8 @@ def docsvault_get_file_profile(token_id: str, api_url: str, file_id: str) -> dic
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         file_id (str): The unique ID of the file.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last minute may be returned. Defaults to True.
 
     Returns:
         dict: A dictionary containing the file's profile and index values.
@@ -836,39 +961,22 @@ def docsvault_get_file_profile(token_id: str, api_url: str, file_id: str) -> dic
     action = "FileDetails/GetFileProfile"
     params = {"TokenID": token_id, "FileID": file_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the profile and index values from the API response
-            file_detail = response_dict["Docsvault"]["Result"]["FileDetail"]
-            indexes = file_detail.get("ListOfIndexes", {}).get("Indexes", [])
-            index_values = {index["Index"]: index["IndexValue"] for index in indexes}
-
-            # Return the profile and index values as a dictionary
-            return {
-                "flag_name": file_detail["FlagName"],
-                "doc_notes": file_detail["DocNotes"],
-                "profile_name": file_detail["ProfileName"],
-                "index_values": index_values
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get file profile. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get file profile. Status code: " + str(response.status_code))
+    # Send the API request and check the response for any errors
+    root = _call(api_url, action, params, "Could not get file profile.", session=session)
+
+    # Extract the profile and index values from the API response
+    records = _XP_FILE(root)
+    if not records:
+        raise ValueError("Could not get file profile. File profile not found in API response.")
+    file_profile = _project(records[0], _PROFILE_FIELDS)
+    indexes = [_project(index, _INDEX_FIELDS) for index in _XP_INDEXES(root)]
+    file_profile["index_values"] = {index["index"]: index["index_value"] for index in indexes}
 
-def docsvault_get_checked_out_files_by_user(token_id: str, api_url: str, user_id: str = "") -> dict:
+    # Return the profile and index values as a dictionary
+    return file_profile
+
+def docsvault_get_checked_out_files_by_user(token_id: str, api_url: str, user_id: str = "",
+                                            *, session: requests.Session | None = None) -> dict:
     """
     Gets the list of checked out files by User ID or for all users.
 
@@ -876,6 +984,7 @@ def docsvault_get_checked_out_files_by_user(token_id: str, api_url: str, user_id
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         user_id (str, optional): The unique ID of the user. Pass a blank string to get details for all users. Defaults to "".
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
 
     Returns:
         dict: A dictionary containing the list of checked out files.
@@ -889,63 +998,26 @@ def docsvault_get_checked_out_files_by_user(token_id: str, api_url: str, user_id
     action = "FileDetails/GetCheckedoutFilesByUser"
     params = {"TokenID": token_id, "UserID": user_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the list of checked out files from the API response
-            file_details = response_dict["Docsvault"]["Result"].get("FileDetail", [])
-
-            # If there is only one file, convert it to a list
-            if isinstance(file_details, dict):
-                file_details = [file_details]
-
-            # Return the list of checked out files as a dictionary
-            return {
-                "checked_out_files": [
-                    {
-                        "file_id": file_detail["FileID"],
-                        "parent_id": file_detail["ParentID"],
-                        "file_name": file_detail["FileName"],
-                        "description": file_detail["Description"],
-                        "flag_name": file_detail["FlagName"],
-                        "file_size": file_detail["FileSize"],
-                        "doc_type": file_detail["DocType"],
-                        "pages": file_detail["Pages"],
-                        "version": file_detail["Version"],
-                        "version_note": file_detail["VersionNote"],
-                        "version_owner": file_detail["VersionOwner"],
-                        "version_owner_name": file_detail["VersionOwnerName"],
-                        "modified_date": file_detail["ModifiedDate"],
-                        "created_date": file_detail["CreatedDate"],
-                        "accessed_date": file_detail["AccessedDate"],
-                        "checked_out": file_detail.get("CheckedOut") == "true",
-                        "checked_out_by": file_detail.get("CheckedOutBy", ""),
-                        "checked_out_by_name": file_detail.get("CheckedOutByName", ""),
-                        "owner_id": file_detail["OwnerID"],
-                        "owner_name": file_detail["OwnerName"],
-                        "location": file_detail["Location"]
-                    }
-                    for file_detail in file_details
-                ]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get checked out files. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get checked out files. Status code: " + str(response.status_code))
-
-def docsvault_get_file_versions(token_id: str, api_url: str, file_id: str) -> dict:
+    # Send the API request and parse the records as they arrive
+    file_details = _iter_call(api_url, action, params, "FileDetail", "Could not get checked out files.",
+                              session=session)
+
+    # Extract the checked out files, the checked out by fields default to "" when the record leaves them out
+    checked_out_files = []
+    for file_detail in file_details:
+        checked_out_file = _project(file_detail, _CHECKED_OUT_FIELDS)
+        checked_out_file["checked_out"] = checked_out_file["checked_out"] == "true"
+        if file_detail.find("CheckedOutBy") is None:
+            checked_out_file["checked_out_by"] = ""
+        if file_detail.find("CheckedOutByName") is None:
+            checked_out_file["checked_out_by_name"] = ""
+        checked_out_files.append(checked_out_file)
+
+    # Return the list of checked out files as a dictionary
+    return {"checked_out_files": checked_out_files}
+
+def docsvault_get_file_versions(token_id: str, api_url: str, file_id: str,
+                                *, session: requests.Session | None = None) -> dict:
     """
     Gets file versions by File ID.
 
@@ -953,6 +1025,7 @@ def docsvault_get_file_versions(token_id: str, api_url: str, file_id: str) -> di
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         file_id (str): The unique ID of the file.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
 
     Returns:
         dict: A dictionary containing the list of file versions.
@@ -966,49 +1039,15 @@ def docsvault_get_file_versions(token_id: str, api_url: str, file_id: str) -> di
     action = "FileDetails/GetFileVersion"
     params = {"TokenID": token_id, "FileID": file_id}
     
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-    
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-    
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-        
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the list of file versions from the API response
-            file_details = response_dict["Docsvault"]["Result"].get("FileDetail", [])
-            
-            # If there is only one file version, convert it to a list
-            if isinstance(file_details, dict):
-                file_details = [file_details]
-            
-            # Return the list of file versions as a dictionary
-            return {
-                "file_versions": [
-                    {
-                        "file_size": file_detail["FileSize"],
-                        "version": file_detail["Version"],
-                        "version_note": file_detail["VersionNote"],
-                        "version_owner": file_detail["VersionOwner"],
-                        "version_owner_name": file_detail["VersionOwnerName"],
-                        "created_date": file_detail["CreatedDate"],
-                        "version_notes": file_detail["VersionNotes"]
-                    }
-                    for file_detail in file_details
-                ]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get file versions. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get file versions. Status code: " + str(response.status_code))
+    # Send the API request and parse the records as they arrive
+    file_details = _iter_call(api_url, action, params, "FileDetail", "Could not get file versions.",
+                              session=session)
+
+    # Return the list of file versions as a dictionary
+    return {"file_versions": [_project(file_detail, _VERSION_FIELDS) for file_detail in file_details]}
 
-def docsvault_get_file_relations(token_id: str, api_url: str, file_id: str) -> dict:
+def docsvault_get_file_relations(token_id: str, api_url: str, file_id: str,
+                                 *, session: requests.Session | None = None) -> dict:
     """
     Gets related documents by File ID.
 
@@ -1016,6 +1055,7 @@ def docsvault_get_file_relations(token_id: str, api_url: str, file_id: str) -> d
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         file_id (str): The unique ID of the file.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
 
     Returns:
         dict: A dictionary containing the details of the related documents.
@@ -1029,45 +1069,85 @@ def docsvault_get_file_relations(token_id: str, api_url: str, file_id: str) -> d
     action = "FileDetails/GetFileRelations"
     params = {"TokenID": token_id, "FileID": file_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the details of the related documents from the API response
-            file_details = response_dict["Docsvault"]["Result"].get("FileDetail", [])
-
-            # If there is only one related document, convert it to a list
-            if isinstance(file_details, dict):
-                file_details = [file_details]
-
-            # Return the details of the related documents as a dictionary
-            return {
-                "related_documents": [
-                    {
-                        "file_id": file_detail["FileID"],
-                        "description": file_detail["Description"],
-                        "location": file_detail["Location"]
-                    }
-                    for file_detail in file_details
-                ]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get related documents. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get related documents. Status code: " + str(response.status_code))
+    # Send the API request and parse the records as they arrive
+    file_details = _iter_call(api_url, action, params, "FileDetail", "Could not get related documents.",
+                              session=session)
+
+    # Return the details of the related documents as a dictionary
+    return {"related_documents": [_project(file_detail, _RELATION_FIELDS) for file_detail in file_details]}
 
-def docsvault_get_folder_details_by_id(token_id: str, api_url: str, folder_id: str) -> dict:
+def docsvault_get_file_profiles_many(token_id: str, api_url: str, file_ids: Iterable[str], max_workers: int = 8,
+                                     *, session: requests.Session | None = None) -> list:
+    """
+    Gets the profiles and index values of several files by File ID, fetching them in parallel.
+
+    Args:
+        token_id (str): The unique session ID.
+        api_url (str): The Docsvault API endpoint URL.
+        file_ids (Iterable[str]): The unique IDs of the files.
+        max_workers (int, optional): The maximum number of concurrent requests. Defaults to 8.
+        session (requests.Session, optional): The session to send the requests with. Defaults to the shared one.
+
+    Returns:
+        list: The dictionaries returned by docsvault_get_file_profile() for each file, in the order of file_ids.
+
+    Raises:
+        requests.exceptions.RequestException: If there was an error making one of the API requests.
+        ValueError: If one of the API responses indicates an error.
+    """
+
+    # Send the API requests in parallel over the pooled connections
+    return _fan_out(docsvault_get_file_profile, token_id, api_url, file_ids, max_workers, session)
+
+def docsvault_get_file_versions_many(token_id: str, api_url: str, file_ids: Iterable[str], max_workers: int = 8,
+                                     *, session: requests.Session | None = None) -> list:
+    """
+    Gets the file versions of several files by File ID, fetching them in parallel.
+
+    Args:
+        token_id (str): The unique session ID.
+        api_url (str): The Docsvault API endpoint URL.
+        file_ids (Iterable[str]): The unique IDs of the files.
+        max_workers (int, optional): The maximum number of concurrent requests. Defaults to 8.
+        session (requests.Session, optional): The session to send the requests with. Defaults to the shared one.
+
+    Returns:
+        list: The dictionaries returned by docsvault_get_file_versions() for each file, in the order of file_ids.
+
+    Raises:
+        requests.exceptions.RequestException: If there was an error making one of the API requests.
+        ValueError: If one of the API responses indicates an error.
+    """
+
+    # Send the API requests in parallel over the pooled connections
+    return _fan_out(docsvault_get_file_versions, token_id, api_url, file_ids, max_workers, session)
+
+def docsvault_get_file_relations_many(token_id: str, api_url: str, file_ids: Iterable[str], max_workers: int = 8,
+                                      *, session: requests.Session | None = None) -> list:
+    """
+    Gets the related documents of several files by File ID, fetching them in parallel.
+
+    Args:
+        token_id (str): The unique session ID.
+        api_url (str): The Docsvault API endpoint URL.
+        file_ids (Iterable[str]): The unique IDs of the files.
+        max_workers (int, optional): The maximum number of concurrent requests. Defaults to 8.
+        session (requests.Session, optional): The session to send the requests with. Defaults to the shared one.
+
+    Returns:
+        list: The dictionaries returned by docsvault_get_file_relations() for each file, in the order of file_ids.
+
+    Raises:
+        requests.exceptions.RequestException: If there was an error making one of the API requests.
+        ValueError: If one of the API responses indicates an error.
+    """
+
+    # Send the API requests in parallel over the pooled connections
+    return _fan_out(docsvault_get_file_relations, token_id, api_url, file_ids, max_workers, session)
+
+@_cached(_DOCUMENT_TTL)
+def docsvault_get_folder_details_by_id(token_id: str, api_url: str, folder_id: str,
+                                       *, session: requests.Session | None = None, cache: bool = True) -> dict:
     """
     Gets folder details by folder ID.
 
@@ -1075,6 +1155,8 @@ def docsvault_get_folder_details_by_id(token_id: str, api_url: str, folder_id: s
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         folder_id (str): The unique ID of the folder.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last minute may be returned. Defaults to True.
 
     Returns:
         dict: A dictionary containing the details of the folder.
@@ -1088,58 +1170,12 @@ def docsvault_get_folder_details_by_id(token_id: str, api_url: str, folder_id: s
     action = "FolderDetails/GetFolderDetailsByID"
     params = {"TokenID": token_id, "FolderID": folder_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the folder details from the API response
-            folder_detail = response_dict["Docsvault"]["Result"].get("FolderDetail", {})
-
-            # Return the folder details as a dictionary
-            return {
-                "folder_id": folder_detail.get("FolderID"),
-                "parent_id": folder_detail.get("ParentID"),
-                "folder_name": folder_detail.get("FolderName"),
-                "description": folder_detail.get("Description"),
-                "flag_name": folder_detail.get("FlagName"),
-                "has_child": folder_detail.get("HasChild"),
-                "modified_date": folder_detail.get("ModifiedDate"),
-                "created_date": folder_detail.get("CreatedDate"),
-                "accessed_date": folder_detail.get("AccessedDate"),
-                "checked_out": folder_detail.get("CheckedOut"),
-                "checked_out_by": folder_detail.get("CheckedOutBy"),
-                "checked_out_by_name": folder_detail.get("CheckedOutByName"),
-                "owner_id": folder_detail.get("OwnerID"),
-                "owner_name": folder_detail.get("OwnerName"),
-                "location": folder_detail.get("Location"),
-                "doc_notes": folder_detail.get("DocNotes"),
-                "profile_id": folder_detail.get("ProfileID"),
-                "profile_name": folder_detail.get("ProfileName"),
-                "list_of_indexes": [
-                    {
-                        "index": index.get("Index"),
-                        "index_value": index.get("IndexValue")
-                    }
-                    for index in folder_detail.get("ListOfIndexes", {}).get("Indexes", [])
-                ]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get folder details. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get folder details. Status code: " + str(response.status_code))
+    # Send the API request and return the folder details as a dictionary
+    return _folder_detail(api_url, action, params, _FOLDER_FIELDS, "Could not get folder details.", session)
 
-def docsvault_get_folder_details_by_location(token_id: str, api_url: str, location: str) -> dict:
+@_cached(_DOCUMENT_TTL)
+def docsvault_get_folder_details_by_location(token_id: str, api_url: str, location: str,
+                                             *, session: requests.Session | None = None, cache: bool = True) -> dict:
     """
     Gets folder details by folder location.
 
@@ -1147,6 +1183,8 @@ def docsvault_get_folder_details_by_location(token_id: str, api_url: str, locati
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         location (str): Full path and name of folder starting from cabinet name.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last minute may be returned. Defaults to True.
 
     Returns:
         dict: A dictionary containing the details of the folder.
@@ -1160,58 +1198,12 @@ def docsvault_get_folder_details_by_location(token_id: str, api_url: str, locati
     action = "FolderDetails/GetFolderDetailsByLocation"
     params = {"TokenID": token_id, "Location": location}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the folder details from the API response
-            folder_detail = response_dict["Docsvault"]["Result"].get("FolderDetail", {})
-
-            # Return the folder details as a dictionary
-            return {
-                "folder_id": folder_detail.get("FolderID"),
-                "parent_id": folder_detail.get("ParentID"),
-                "folder_name": folder_detail.get("FolderName"),
-                "description": folder_detail.get("Description"),
-                "flag_name": folder_detail.get("FlagName"),
-                "has_child": folder_detail.get("HasChild"),
-                "modified_date": folder_detail.get("ModifiedDate"),
-                "created_date": folder_detail.get("CreatedDate"),
-                "accessed_date": folder_detail.get("AccessedDate"),
-                "checked_out": folder_detail.get("CheckedOut"),
-                "checked_out_by": folder_detail.get("CheckedOutBy"),
-                "checked_out_by_name": folder_detail.get("CheckedOutByName"),
-                "owner_id": folder_detail.get("OwnerID"),
-                "owner_name": folder_detail.get("OwnerName"),
-                "location": folder_detail.get("Location"),
-                "doc_notes": folder_detail.get("DocNotes"),
-                "profile_id": folder_detail.get("ProfileID"),
-                "profile_name": folder_detail.get("ProfileName"),
-                "list_of_indexes": [
-                    {
-                        "index": index.get("Index"),
-                        "index_value": index.get("IndexValue")
-                    }
-                    for index in folder_detail.get("ListOfIndexes", {}).get("Indexes", [])
-                ]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get folder details. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get folder details. Status code: " + str(response.status_code))
+    # Send the API request and return the folder details as a dictionary
+    return _folder_detail(api_url, action, params, _FOLDER_FIELDS, "Could not get folder details.", session)
 
-def docsvault_get_folder_profile(token_id: str, api_url: str, folder_id: str) -> dict:
+@_cached(_DOCUMENT_TTL)
+def docsvault_get_folder_profile(token_id: str, api_url: str, folder_id: str,
+                                 *, session: requests.Session | None = None, cache: bool = True) -> dict:
     """
     Gets the folder profile and corresponding index values by folder ID.
 
@@ -1219,6 +1211,8 @@ def docsvault_get_folder_profile(token_id: str, api_url: str, folder_id: str) ->
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         folder_id (str): The unique ID of the folder.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
+        cache (bool, optional): Whether a result cached within the last minute may be returned. Defaults to True.
 
     Returns:
         dict: A dictionary containing the folder profile and index values.
@@ -1232,43 +1226,11 @@ def docsvault_get_folder_profile(token_id: str, api_url: str, folder_id: str) ->
     action = "FolderDetails/GetFolderProfile"
     params = {"TokenID": token_id, "FolderID": folder_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the folder profile and index values from the API response
-            folder_detail = response_dict["Docsvault"]["Result"].get("FolderDetail", {})
-
-            # Return the folder profile and index values as a dictionary
-            return {
-                "flag_name": folder_detail.get("FlagName"),
-                "doc_notes": folder_detail.get("DocNotes"),
-                "profile_name": folder_detail.get("ProfileName"),
-                "list_of_indexes": [
-                    {
-                        "index": index.get("Index"),
-                        "index_value": index.get("IndexValue")
-                    }
-                    for index in folder_detail.get("ListOfIndexes", {}).get("Indexes", [])
-                ]
-            }
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get folder profile. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get folder profile. Status code: " + str(response.status_code))
+    # Send the API request and return the folder profile and index values as a dictionary
+    return _folder_detail(api_url, action, params, _PROFILE_FIELDS, "Could not get folder profile.", session)
 
-def docsvault_get_folder_relations(token_id: str, api_url: str, folder_id: str) -> dict:
+def docsvault_get_folder_relations(token_id: str, api_url: str, folder_id: str,
+                                   *, session: requests.Session | None = None) -> dict:
     """
     Gets related documents by Folder ID.
 
@@ -1276,6 +1238,7 @@ def docsvault_get_folder_relations(token_id: str, api_url: str, folder_id: str)
         token_id (str): The unique session ID.
         api_url (str): The Docsvault API endpoint URL.
         folder_id (str): Unique Folder ID.
+        session (requests.Session, optional): The session to send the request with. Defaults to the shared one.
 
     Returns:
         dict: A dictionary containing the details of the related documents.
@@ -1289,59 +1252,37 @@ def docsvault_get_folder_relations(token_id: str, api_url: str, folder_id: str)
     action = "FolderDetails/GetFolderRelations"
     params = {"TokenID": token_id, "FolderID": folder_id}
 
-    # Construct the full API URL
-    full_api_url = api_url.rstrip("/") + "/DocsvaultAPI/" + action
-
-    # Send the API request
-    response = requests.get(full_api_url, params=params)
-
-    # Check the response status code
-    if response.status_code == 200:
-        # Parse the API response XML
-        response_xml = response.content
-        response_dict = xmltodict.parse(response_xml)
-
-        # Check for any API errors
-        if response_dict["Docsvault"]["Response"]["StatusCode"] == "0":
-            # Extract the related documents from the API response
-            related_docs = response_dict["Docsvault"]["Result"].get("RelatedDocs", {}).get("Doc", [])
-
-            # Return the related documents as a list of dictionaries
-            return [
-                {
-                    "doc_id": doc.get("DocID"),
-                    "doc_name": doc.get("DocName"),
-                    "doc_type": doc.get("DocType"),
-                    "version": doc.get("Version"),
-                    "folder_id": doc.get("FolderID"),
-                    "folder_name": doc.get("FolderName"),
-                    "location": doc.get("Location"),
-                    "modified_date": doc.get("ModifiedDate"),
-                    "created_date": doc.get("CreatedDate"),
-                    "accessed_date": doc.get("AccessedDate"),
-                    "size": doc.get("Size"),
-                    "extension": doc.get("Extension"),
-                    "checksum": doc.get("Checksum"),
-                    "pages": doc.get("Pages"),
-                    "author": doc.get("Author"),
-                    "title": doc.get("Title"),
-                    "subject": doc.get("Subject"),
-                    "keywords": doc.get("Keywords"),
-                    "category": doc.get("Category"),
-                    "status": doc.get("Status"),
-                    "comment": doc.get("Comment"),
-                    "owner_id": doc.get("OwnerID"),
-                    "owner_name": doc.get("OwnerName"),
-                    "file_path": doc.get("FilePath"),
-                    "doc_notes": doc.get("DocNotes"),
-                    "workflow_status": doc.get("WorkflowStatus"),
-                    "web_access": doc.get("WebAccess"),
-                    "task_id": doc.get("TaskID")
-                }
-                for doc in related_docs
-            ]
-        else:
-            error_message = response_dict["Docsvault"]["Response"]["Message"]
-            raise ValueError("Could not get related documents. " + error_message)
-    else:
-        raise requests.exceptions.RequestException("Could not get related documents. Status code: " + str(response.status_code))
+    # Send the API request and parse the records as they arrive
+    related_docs = _iter_call(api_url, action, params, "Doc", "Could not get related documents.", session=session)
+
+    # Return the related documents as a list of dictionaries
+    return [_project(doc, _RELATED_DOC_FIELDS) for doc in related_docs]
+
+# Async twins of the API calls above, so independent calls can run concurrently, e.g.
+#
+#     details, profile, versions, relations = await asyncio.gather(
+#         docsvault_get_file_details_async(token_id, api_url, file_id),
+#         docsvault_get_file_profile_async(token_id, api_url, file_id),
+#         docsvault_get_file_versions_async(token_id, api_url, file_id),
+#         docsvault_get_file_relations_async(token_id, api_url, file_id))
+docsvault_login_async = _to_async(docsvault_login)
+docsvault_login_post_async = _to_async(docsvault_login_post)
+docsvault_logout_async = _to_async(docsvault_logout)
+docsvault_get_login_user_id_async = _to_async(docsvault_get_login_user_id)
+docsvault_get_user_details_by_name_async = _to_async(docsvault_get_user_details_by_name)
+docsvault_get_user_details_by_id_async = _to_async(docsvault_get_user_details_by_id)
+docsvault_get_user_details_by_email_async = _to_async(docsvault_get_user_details_by_email)
+docsvault_get_readonly_users_async = _to_async(docsvault_get_readonly_users)
+docsvault_get_webaccess_users_async = _to_async(docsvault_get_webaccess_users)
+docsvault_get_user_groups_async = _to_async(docsvault_get_user_groups)
+docsvault_get_connected_users_async = _to_async(docsvault_get_connected_users)
+docsvault_get_file_details_async = _to_async(docsvault_get_file_details)
+docsvault_get_file_details_by_location_async = _to_async(docsvault_get_file_details_by_location)
+docsvault_get_file_profile_async = _to_async(docsvault_get_file_profile)
+docsvault_get_checked_out_files_by_user_async = _to_async(docsvault_get_checked_out_files_by_user)
+docsvault_get_file_versions_async = _to_async(docsvault_get_file_versions)
+docsvault_get_file_relations_async = _to_async(docsvault_get_file_relations)
+docsvault_get_folder_details_by_id_async = _to_async(docsvault_get_folder_details_by_id)
+docsvault_get_folder_details_by_location_async = _to_async(docsvault_get_folder_details_by_location)
+docsvault_get_folder_profile_async = _to_async(docsvault_get_folder_profile)
+docsvault_get_folder_relations_async = _to_async(docsvault_get_folder_relations)
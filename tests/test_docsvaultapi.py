@@ -0,0 +1,223 @@
+import inspect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+import docsvaultapi
+
+GROUPS = "".join(
+    "<Group><GroupName>group-%d</GroupName><GroupID>%d</GroupID><Description>Group %d</Description></Group>" % (i, i, i)
+    for i in range(2)
+)
+
+FILE = ("<FileDetail><FileID>7</FileID><FileName> report.pdf\n</FileName><Description> </Description><FlagName/>"
+        "<CheckedOut>false</CheckedOut><ListOfIndexes>"
+        "<Indexes><Index>Year</Index><IndexValue>2024</IndexValue></Indexes></ListOfIndexes></FileDetail>")
+
+
+class FakeDocsvault:
+    """
+    Local HTTP server answering Docsvault API actions with canned <Result> contents.
+    """
+
+    def __init__(self):
+        self.results = {"Login": "<TokenID>token</TokenID>", "GetUserGroup": GROUPS, "GetFileDetailsByID": FILE}
+        # Whole response bodies, served instead of a successful response wrapping the result
+        self.bodies = {}
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                action = url.path.rsplit("/", 1)[-1]
+                fake.requests.append((action, parse_qs(url.query)))
+                if action in fake.bodies:
+                    body = fake.bodies[action].encode()
+                else:
+                    body = ("<Docsvault><Response><StatusCode>0</StatusCode><Message>OK</Message></Response>"
+                            "<Result>%s</Result></Docsvault>" % fake.results[action]).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_POST = do_GET
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:%d/" % self.server.server_port
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def count(self, action):
+        return sum(1 for name, _ in self.requests if name == action)
+
+
+@pytest.fixture
+def fake_api():
+    fake = FakeDocsvault()
+    yield fake
+    fake.server.shutdown()
+    docsvaultapi._TOKEN_CACHE.clear()
+    docsvaultapi._USERID_CACHE.clear()
+    docsvaultapi._LOOKUP_CACHE.clear()
+
+
+def test_user_groups_signature():
+    parameters = inspect.signature(docsvaultapi.docsvault_get_user_groups).parameters
+    assert list(parameters) == ["token_id", "user_id", "api_url", "session", "cache"]
+    assert parameters["session"].kind is inspect.Parameter.KEYWORD_ONLY
+    assert parameters["cache"].kind is inspect.Parameter.KEYWORD_ONLY
+
+
+def test_cache_flag_is_keyword_only(fake_api):
+    docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url)
+    with pytest.raises(TypeError):
+        docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url, None, False)
+    assert fake_api.count("GetUserGroup") == 1
+
+
+def test_user_groups_argument_order(fake_api):
+    groups = docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url)
+    assert [group["group_name"] for group in groups] == ["group-0", "group-1"]
+    assert fake_api.requests == [("GetUserGroup", {"TokenID": ["token"], "UserID": ["user-1"]})]
+
+
+def test_record_texts_are_stripped(fake_api):
+    details = docsvaultapi.docsvault_get_file_details("token", fake_api.url, "7")
+    assert details["file_name"] == "report.pdf"
+    assert details["description"] is None
+    assert details["flag_name"] is None
+    assert details["doc_notes"] is None
+
+
+def test_empty_elements_map_to_none(fake_api):
+    fake_api.results["GetUserGroup"] = "<Group><GroupName>group</GroupName><GroupID>1</GroupID><Description/></Group>"
+    groups = docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url)
+    assert groups == [{"group_name": "group", "group_id": "1", "description": None}]
+
+    fake_api.results["GetFileProfile"] = ("<FileDetail><FlagName/><ProfileName>Invoice</ProfileName><ListOfIndexes>"
+                                          "<Indexes><Index>Client</Index><IndexValue/></Indexes></ListOfIndexes>"
+                                          "</FileDetail>")
+    profile = docsvaultapi.docsvault_get_file_profile("token", fake_api.url, "7")
+    assert profile == {
+        "flag_name": None, "doc_notes": None, "profile_name": "Invoice", "index_values": {"Client": None}
+    }
+
+
+def test_checked_out_by_defaults(fake_api):
+    fake_api.results["GetCheckedoutFilesByUser"] = (
+        "<FileDetail><FileID>1</FileID><CheckedOut>true</CheckedOut></FileDetail>"
+        "<FileDetail><FileID>2</FileID><CheckedOut>false</CheckedOut><CheckedOutBy/><CheckedOutByName/></FileDetail>"
+    )
+    files = docsvaultapi.docsvault_get_checked_out_files_by_user("token", fake_api.url)["checked_out_files"]
+
+    # Missing tags default to "", empty ones map to None like every other field
+    assert [(f["checked_out"], f["checked_out_by"], f["checked_out_by_name"]) for f in files] == [
+        (True, "", ""), (False, None, None)
+    ]
+
+
+@pytest.mark.parametrize("body", ["<html><body>login</body></html>", "<Docsvault><Result/></Docsvault>"])
+def test_streamed_list_without_status(fake_api, body):
+    fake_api.bodies["GetReadonlyUsers"] = body
+    with pytest.raises(ValueError, match="^Could not get readonly users"):
+        docsvaultapi.docsvault_get_readonly_users("token", fake_api.url)
+
+
+USER = "<UserDetail><UserID>1</UserID></UserDetail>"
+
+
+@pytest.mark.parametrize("call, action, record", [
+    (lambda url: docsvaultapi.docsvault_get_user_details_by_id("token", "1", url), "GetUserDetailsByID", USER),
+    (lambda url: docsvaultapi.docsvault_get_file_details("token", url, "7"), "GetFileDetailsByID", FILE),
+    (lambda url: docsvaultapi.docsvault_get_file_profile("token", url, "7"), "GetFileProfile", FILE),
+])
+def test_lookup_without_record(fake_api, call, action, record):
+    fake_api.results[action] = ""
+    with pytest.raises(ValueError, match="not found in API response"):
+        call(fake_api.url)
+
+    # Failed lookups are not cached
+    fake_api.results[action] = record
+    call(fake_api.url)
+    assert fake_api.count(action) == 2
+
+
+def test_padded_status(fake_api):
+    fake_api.bodies["GetUserGroup"] = ("<Docsvault><Response><StatusCode> 0 </StatusCode><Message> OK </Message>"
+                                       "</Response><Result>%s</Result></Docsvault>" % GROUPS)
+    assert len(docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url)) == 2
+
+    fake_api.bodies["GetFileDetailsByID"] = ("<Docsvault><Response><StatusCode>\n1\n</StatusCode>"
+                                             "<Message>\n  Invalid Token ID\n</Message></Response></Docsvault>")
+    with pytest.raises(ValueError) as error:
+        docsvaultapi.docsvault_get_file_details("token", fake_api.url, "7")
+    assert str(error.value) == "Could not get file details. Invalid Token ID"
+
+
+def test_login_token_cache(fake_api, monkeypatch):
+    assert docsvaultapi.docsvault_login("user", "secret", fake_api.url) == "token"
+    docsvaultapi.docsvault_login("user", "secret", fake_api.url)
+    assert fake_api.count("Login") == 1
+
+    docsvaultapi.docsvault_login("user", "secret", fake_api.url, cache=False)
+    assert fake_api.count("Login") == 2
+
+    # With a TTL of 0 the Token ID is never reused
+    monkeypatch.setattr(docsvaultapi, "TOKEN_TTL", 0)
+    docsvaultapi.docsvault_login("user", "other", fake_api.url)
+    docsvaultapi.docsvault_login("user", "other", fake_api.url)
+    assert fake_api.count("Login") == 4
+
+
+def test_lookup_cache(fake_api):
+    first = docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url)
+    assert docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url) == first
+    assert fake_api.count("GetUserGroup") == 1
+
+    # Bypassing the cache, another user and another token all go to the server
+    docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url, cache=False)
+    docsvaultapi.docsvault_get_user_groups("token", "user-2", fake_api.url)
+    docsvaultapi.docsvault_get_user_groups("other", "user-1", fake_api.url)
+    assert fake_api.count("GetUserGroup") == 4
+
+    # Invalidating the token drops its cached lookups
+    docsvaultapi.docsvault_invalidate("token")
+    docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url)
+    assert fake_api.count("GetUserGroup") == 5
+
+
+def test_cached_results_are_copies(fake_api):
+    first = docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url)
+    first[0]["group_name"] = "changed"
+    first.append({})
+
+    second = docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url)
+    assert [group["group_name"] for group in second] == ["group-0", "group-1"]
+    second.clear()
+
+    assert len(docsvaultapi.docsvault_get_user_groups("token", "user-1", fake_api.url)) == 2
+    assert fake_api.count("GetUserGroup") == 1
+
+    details = docsvaultapi.docsvault_get_file_details("token", fake_api.url, "7")
+    details["file_name"] = "changed"
+    details["indexes"].clear()
+
+    details = docsvaultapi.docsvault_get_file_details("token", fake_api.url, "7")
+    assert details["file_name"] == "report.pdf"
+    assert details["indexes"] == [{"index": "Year", "index_value": "2024"}]
+    assert fake_api.count("GetFileDetailsByID") == 1
+
+
+def test_file_profiles_many(fake_api):
+    fake_api.results["GetFileProfile"] = "<FileDetail><ProfileName>Invoice</ProfileName></FileDetail>"
+    profiles = docsvaultapi.docsvault_get_file_profiles_many("token", fake_api.url, ["1", "2", "3"], max_workers=3)
+    assert [profile["profile_name"] for profile in profiles] == ["Invoice"] * 3
+    file_ids = [query["FileID"][0] for action, query in fake_api.requests if action == "GetFileProfile"]
+    assert sorted(file_ids) == ["1", "2", "3"]